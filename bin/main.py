@@ -5,6 +5,12 @@ import time
 
 from jsonbuilder import jsonbuilder
 
+def positive_int(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"should be at least 1, got {value}")
+    return n
+
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("-f", "--format")
@@ -12,6 +18,8 @@ def parse_args():
     parser.add_argument("-o", "--output")
     parser.add_argument("-d", "--date")
     parser.add_argument("-i", "--inspect_row", type=int)
+    parser.add_argument("--preview", type=positive_int)
+    parser.add_argument("--preview_elements", type=positive_int)
     parser.add_argument("-p", "--profiler", action="store_true")
     parser.add_argument("-v", "--verbose", action="store_true")
     return parser.parse_args()
@@ -32,6 +40,8 @@ def main(
     output=None,
     date=None,
     inspect_row=None,
+    preview=None,
+    preview_elements=None,
     verbose=False,
 ):
     start = time.time()
@@ -54,6 +64,8 @@ def main(
         table,
         date=date,
         inspect_row=inspect_row,
+        preview=preview,
+        preview_elements=preview_elements,
     )
 
     output_json = jbTree.build().toJson(indent=2)
@@ -65,7 +77,7 @@ def main(
     logging.info("Process completed")
     logging.info("Elapsed time: " + str(round(time.time() - start, 3)) + " seconds")
 
-    if verbose:
+    if verbose or preview is not None or preview_elements is not None:
         for df in jbTree.intermediate_dfs:
             print("\n", df, "\n")
         if len(output_json) > 100000:
@@ -98,5 +110,7 @@ if __name__ == "__main__":
             output=args.output,
             date=args.date,
             inspect_row=args.inspect_row,
+            preview=args.preview,
+            preview_elements=args.preview_elements,
             verbose=args.verbose,
         )
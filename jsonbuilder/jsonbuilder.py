@@ -1,4 +1,5 @@
 import datetime
+import itertools
 import logging
 import re
 
@@ -24,21 +25,56 @@ class Tree:
 
     A sample of what the dataframe looked like after each df_transform is
     stored in t.intermediate_dfs
+
+    Passing preview=N builds a partial JSON for quick format authoring: only
+    the first N rows (or N groups of the top-most group_by) are loaded.
+    Passing preview_elements=K additionally stops every iterated or grouped
+    node after its first K elements.
+
+    A group_by may be one column or a list of columns, in which case each
+    unique combination of values counts as one group. When previewing groups,
+    a CSV is read until more than N groups have been seen. Rows of the first
+    N groups that appear after that point are not loaded, so groups that are
+    not contiguous in the file may be incomplete. This is not detected.
     """
 
-    def __init__(self, fmt, table, date=None, inspect_row=None):
+    PREVIEW_CHUNKSIZE = 10000
+    # read_csv kwargs that can't be combined with nrows or chunksize
+    PREVIEW_UNCHUNKABLE_KWARGS = ("skipfooter", "iterator", "chunksize")
+
+    def __init__(
+        self,
+        fmt,
+        table,
+        date=None,
+        inspect_row=None,
+        preview=None,
+        preview_elements=None,
+    ):
         logging.info("Initializing Tree")
+        for name, limit in [("preview", preview), ("preview_elements", preview_elements)]:
+            if limit is not None and limit < 1:
+                logging.error(f"Invalid {name}: {limit}")
+                raise Exception(f"Invalid {name}: {limit}, should be at least 1")
         mapping = fmt.get("mapping", {})
         functions = fmt.get("functions", [])
         df_transforms = fmt.get("df_transforms", [])
         raw_header = fmt.get("raw_header", False)
         table_kwargs = fmt.get("table_kwargs", {})
 
+        self.preview = preview
+        self.preview_elements = preview_elements
         self.eval = Interpreter()
         self.load_symtable(functions, date)
 
         self.root = Tree.parse_mapping(self, mapping, 1)
-        self.df = Tree.load_table(table, raw_header, **table_kwargs)
+        self.df = Tree.load_table(
+            table,
+            raw_header,
+            preview=preview,
+            group_by=Tree.find_group_by(self.root),
+            **table_kwargs,
+        )
         self.intermediate_dfs = []
 
         self.transform_table(df_transforms, inspect_row)
@@ -62,25 +98,111 @@ class Tree:
         return this
 
     @staticmethod
-    def load_table(table, raw_header, **kwargs):
+    def find_group_by(root):
+        # The top-most node that iterates decides what a preview counts,
+        # rows for 'iterate' and groups for 'group_by'. The root itself is
+        # never iterated by Tree.build, so the search starts at its children
+        nodes = list(root.children)
+        while nodes:
+            node = nodes.pop(0)
+            if node.group_by:
+                return node.group_by
+            if node.iterate:
+                return None
+            nodes.extend(node.children)
+        return None
+
+    @staticmethod
+    def load_table(table, raw_header, preview=None, group_by=None, **kwargs):
         logging.info("Loading table")
         try:
             sep = kwargs.pop('sep', Tree.sep_guesser(table))
-            df = pandas.read_csv(table, sep=sep, **kwargs)
-        except Exception:
+            if preview is not None:
+                df = Tree.read_csv_preview(
+                    table, raw_header, preview, group_by, sep=sep, **kwargs
+                )
+            else:
+                df = pandas.read_csv(table, sep=sep, **kwargs)
+        except Exception as csv_error:
+            if (
+                preview is not None
+                and Tree.group_keys(group_by) is None
+                and not any(k in kwargs for k in Tree.PREVIEW_UNCHUNKABLE_KWARGS)
+            ):
+                kwargs.setdefault("nrows", preview)
             try:
                 df = pandas.read_excel(table, **kwargs)
             except Exception:
+                logging.error(f"Failed to load table as CSV: {csv_error}")
                 logging.error("Failed to load table")
                 raise
         df.index += 1
         if not raw_header:
-            df.columns = df.columns.str.strip()
-            df.columns = df.columns.str.lower()
-            df.columns = df.columns.str.replace('-','_')
-            df.columns = df.columns.str.replace(' ', '_')
+            df.columns = Tree.clean_header(df.columns)
+        if preview is not None:
+            df = Tree.truncate_preview(df, preview, group_by)
         return df
 
+    @staticmethod
+    def read_csv_preview(table, raw_header, preview, group_by, **kwargs):
+        if any(k in kwargs for k in Tree.PREVIEW_UNCHUNKABLE_KWARGS):
+            # Read the full table, it is truncated afterwards in load_table
+            return pandas.read_csv(table, **kwargs)
+        keys = Tree.group_keys(group_by)
+        if keys is None:
+            kwargs.setdefault("nrows", preview)
+            return pandas.read_csv(table, **kwargs)
+        chunks = []
+        groups = set()
+        with pandas.read_csv(table, chunksize=Tree.PREVIEW_CHUNKSIZE, **kwargs) as reader:
+            for chunk in reader:
+                chunks.append(chunk)
+                columns = chunk.columns if raw_header else Tree.clean_header(chunk.columns)
+                if not all(k in columns for k in keys):
+                    # The group_by column is created by a df_transform, so
+                    # groups can't be counted until the table is transformed
+                    if sum(len(c.index) for c in chunks) >= preview:
+                        break
+                    continue
+                locs = [columns.get_loc(k) for k in keys]
+                groups.update(
+                    chunk.iloc[:, locs].dropna().itertuples(index=False, name=None)
+                )
+                if len(groups) > preview:
+                    logging.info(
+                        f"Preview stopped reading after {sum(len(c.index) for c in chunks)} rows, "
+                        f"any later rows of the first {preview} groups are not included"
+                    )
+                    break
+        return pandas.concat(chunks, ignore_index=True)
+
+    @staticmethod
+    def truncate_preview(df, preview, group_by):
+        keys = Tree.group_keys(group_by)
+        if keys is not None and all(k in df.columns for k in keys):
+            first_groups = df[keys].dropna().drop_duplicates().head(preview)
+            in_first_groups = pandas.MultiIndex.from_frame(df[keys]).isin(
+                pandas.MultiIndex.from_frame(first_groups)
+            )
+            return df[in_first_groups]
+        return df.head(preview)
+
+    @staticmethod
+    def group_keys(group_by):
+        if isinstance(group_by, str):
+            return [group_by]
+        if isinstance(group_by, list):
+            return group_by
+        return None
+
+    @staticmethod
+    def clean_header(columns):
+        columns = columns.str.strip()
+        columns = columns.str.lower()
+        columns = columns.str.replace('-','_')
+        columns = columns.str.replace(' ', '_')
+        return columns
+
     @staticmethod
     def sep_guesser(table):
         candidates = [",", ";", "\t", "|"]
@@ -244,14 +366,14 @@ class Node:
             except Exception:
                 logging.error(f"Failed to group_by: '{self.group_by}'")
                 raise
-            for group in groups:
+            for group in itertools.islice(groups, self.tree.preview_elements):
                 self.df = group[1]
                 self.row = next(self.df.itertuples())
                 yield
         elif self.iterate:
             rows = self.df.itertuples()
             self.df = None
-            for row in rows:
+            for row in itertools.islice(rows, self.tree.preview_elements):
                 self.row = row
                 yield
         else:
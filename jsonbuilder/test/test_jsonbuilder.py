@@ -1,6 +1,11 @@
-from jsonbuilder.jsonbuilder import Tree
+import logging
+
+import pandas
+import pytest
 import rapidjson
 
+from jsonbuilder.jsonbuilder import Tree
+
 test_data_folder = 'jsonbuilder/test/testdata/'
 
 def test_1():
@@ -100,3 +105,124 @@ def test_full_csv_excel():
     with open(test_data_folder + 'formatfull.json', 'r') as f:
         output2 = Tree(rapidjson.load(f), test_data_folder + 'testfull.xlsx', date='2020-02-02').build().toJson(indent=2)
     assert output1 == output2 
+
+def test_preview_rows():
+    with open(test_data_folder + 'format1.json', 'r') as f:
+        t = Tree(rapidjson.load(f), test_data_folder + 'test.csv', preview=2)
+    output = rapidjson.loads(t.build().toJson())
+    assert len(t.df.index) == 2
+    assert [o['date'] for o in output] == ['2019-05-18', '2020-05-18']
+
+def test_preview_groups():
+    with open(test_data_folder + 'format2.json', 'r') as f:
+        t = Tree(rapidjson.load(f), test_data_folder + 'test.csv', preview=1)
+    output = rapidjson.loads(t.build().toJson())
+    assert len(t.df.index) == 2
+    assert [o['currency'] for o in output] == ['USD_SOFR']
+    assert len(output[0]['ir_curves'][0]['points']) == 2
+    assert len(t.intermediate_dfs) == 3
+
+def test_preview_elements():
+    with open(test_data_folder + 'format2.json', 'r') as f:
+        t = Tree(rapidjson.load(f), test_data_folder + 'test.csv', preview_elements=1)
+    output = rapidjson.loads(t.build().toJson())
+    assert len(t.df.index) == 4
+    assert [o['currency'] for o in output] == ['USD_SOFR']
+    assert len(output[0]['ir_curves'][0]['points']) == 1
+
+def test_preview_groups_chunked(monkeypatch, caplog):
+    monkeypatch.setattr(Tree, 'PREVIEW_CHUNKSIZE', 1)
+    with open(test_data_folder + 'format2.json', 'r') as f:
+        fmt = rapidjson.load(f)
+    with caplog.at_level(logging.INFO):
+        t = Tree(fmt, test_data_folder + 'test.csv', preview=1)
+    assert len(t.df.index) == 2
+    assert 'Preview stopped reading after 3 rows' in caplog.text
+
+def test_preview_group_by_list(monkeypatch, caplog):
+    monkeypatch.setattr(Tree, 'PREVIEW_CHUNKSIZE', 1)
+    fmt = {
+        "mapping": {
+            "type": "array",
+            "children": [{
+                "type": "object",
+                "group_by": ["name", "discount_factor"],
+                "children": [
+                    {"name": "name", "column": "name"},
+                    {"name": "discount_factor", "column": "discount_factor"}
+                ]
+            }]
+        }
+    }
+    with caplog.at_level(logging.INFO):
+        t = Tree(fmt, test_data_folder + 'test.csv', preview=2)
+    assert 'Preview stopped reading after 3 rows' in caplog.text
+    assert len(t.df.index) == 2
+    assert rapidjson.loads(t.build().toJson()) == [
+        {"name": "USD_OIS", "discount_factor": 0.99},
+        {"name": "USD_OIS", "discount_factor": 0.95},
+    ]
+
+def test_preview_root_group_by_ignored():
+    fmt = {
+        "mapping": {
+            "type": "array",
+            "group_by": "name",
+            "children": [{"iterate": True, "column": "date"}]
+        }
+    }
+    t = Tree(fmt, test_data_folder + 'test.csv', preview=1)
+    assert len(t.df.index) == 1
+    assert rapidjson.loads(t.build().toJson()) == ['2019-05-18']
+
+def test_preview_transformed_group_by(monkeypatch):
+    monkeypatch.setattr(Tree, 'PREVIEW_CHUNKSIZE', 1)
+    fmt = {
+        "df_transforms": ["df['name'].rename('curve')"],
+        "mapping": {
+            "type": "array",
+            "children": [{"group_by": "curve", "column": "curve"}]
+        }
+    }
+    t = Tree(fmt, test_data_folder + 'test.csv', preview=1)
+    assert len(t.df.index) == 1
+    assert rapidjson.loads(t.build().toJson()) == ['USD_OIS']
+
+def test_preview_unchunkable_kwargs():
+    with open(test_data_folder + 'format1.json', 'r') as f:
+        fmt = rapidjson.load(f)
+    fmt['table_kwargs'] = {'skipfooter': 1, 'engine': 'python'}
+    t = Tree(fmt, test_data_folder + 'test.csv', preview=2)
+    output = rapidjson.loads(t.build().toJson())
+    assert [o['date'] for o in output] == ['2019-05-18', '2020-05-18']
+
+def test_preview_unchunkable_kwargs_xlsx():
+    with open(test_data_folder + 'format1.json', 'r') as f:
+        fmt = rapidjson.load(f)
+    fmt['table_kwargs'] = {'skipfooter': 1}
+    t = Tree(fmt, test_data_folder + 'test.xlsx', preview=2)
+    output = rapidjson.loads(t.build().toJson())
+    assert [o['date'] for o in output] == ['2019-05-18', '2020-05-18']
+
+def test_preview_xlsx(monkeypatch):
+    calls = []
+    read_excel = pandas.read_excel
+    def spy(*args, **kwargs):
+        calls.append(kwargs)
+        return read_excel(*args, **kwargs)
+    monkeypatch.setattr(pandas, 'read_excel', spy)
+    with open(test_data_folder + 'format1.json', 'r') as f:
+        t = Tree(rapidjson.load(f), test_data_folder + 'test.xlsx', preview=2)
+    assert calls[-1]['nrows'] == 2
+    assert len(t.df.index) == 2
+
+@pytest.mark.parametrize('kwargs', [
+    {'preview': 0},
+    {'preview': -1},
+    {'preview_elements': 0},
+])
+def test_preview_invalid(kwargs):
+    with open(test_data_folder + 'format1.json', 'r') as f:
+        fmt = rapidjson.load(f)
+    with pytest.raises(Exception, match='should be at least 1'):
+        Tree(fmt, test_data_folder + 'test.csv', **kwargs)